@@ -1,30 +1,73 @@
-from flask import Flask, jsonify, request, abort
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import Flask, Response, request, abort
+from flask_compress import Compress
+from psycopg2.extras import RealDictCursor, execute_values
+from werkzeug.exceptions import HTTPException
+import io
+import orjson
 import os
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import redis
 import time
 
 app = Flask(__name__)
 
+# JSON list responses are dominated by repeated keys and compress well;
+# level 5 trades a little CPU for most of the wire savings.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 5
+Compress(app)
+
+
+def J(obj, status=200):
+    """Serialize a JSON response with orjson instead of Flask's jsonify."""
+    return Response(
+        orjson.dumps(obj),
+        status=status,
+        mimetype='application/json'
+    )
+
 
 # ==========================
-# 🔹 Database Connection
+# 🔹 Database Connection Pool
 # ==========================
-def get_db_connection():
-    db_host = os.environ.get('DB_HOST')
-    db_name = os.environ.get('DB_NAME')
-    db_user = os.environ.get('DB_USER')
-    db_pass = os.environ.get('DB_PASS')
-
+# Resolved once at import so missing configuration fails at startup rather
+# than on first traffic. To pool across processes, point DB_PORT at
+# PgBouncer (6432, see pgbouncer.ini) AND set DB_PREPARED_STATEMENTS=0 --
+# transaction mode rotates backends between transactions, so per-session
+# prepared statements would fail there. Defaults to Postgres itself.
+DB_KW = dict(
+    host=os.environ['DB_HOST'],
+    port=os.environ.get('DB_PORT', '5432'),
+    database=os.environ['DB_NAME'],
+    user=os.environ['DB_USER'],
+    password=os.environ['DB_PASS']
+)
+
+
+class NewsConnection(psycopg2.extensions.connection):
+    """Connection with a flag for sessions that already ran PREPARE.
+
+    The base C connection type has no instance __dict__, so the flag must
+    live on a Python subclass.
+    """
+    news_prepared = False
+
+
+def create_pool():
     retries = 5
     while retries > 0:
         try:
-            conn = psycopg2.connect(
-                host=db_host,
-                database=db_name,
-                user=db_user,
-                password=db_pass
+            return psycopg2.pool.ThreadedConnectionPool(
+                minconn=2,
+                maxconn=(os.cpu_count() or 1) * 2 + 1,
+                connection_factory=NewsConnection,
+                **DB_KW
             )
-            return conn
         except psycopg2.OperationalError:
             retries -= 1
             app.logger.warning("Database not ready, retrying...")
@@ -34,20 +77,184 @@ def get_db_connection():
     return None
 
 
+POOL = create_pool()
+
+# How long a request may wait for a pooled connection before giving up
+# with a 503. Kept short so a database outage fails fast instead of
+# parking request threads.
+POOL_TIMEOUT = float(os.environ.get('POOL_TIMEOUT', '1.0'))
+
+# Statements prepared once per pooled connection and reused via EXECUTE, so
+# Postgres parses and plans each of them a single time per session. They
+# only work on direct (or session-pooled) connections; set
+# DB_PREPARED_STATEMENTS=0 to fall back to plain parameterized SQL when
+# connecting through PgBouncer in transaction mode.
+USE_PREPARED_STATEMENTS = os.environ.get('DB_PREPARED_STATEMENTS', '1') == '1'
+
+PREPARED_STATEMENTS = (
+    "PREPARE news_insert (text, text) AS "
+    "INSERT INTO news (title, content) VALUES ($1, $2) RETURNING id;",
+
+    "PREPARE news_update (text, text, integer) AS "
+    "UPDATE news SET title = COALESCE($1, title), "
+    "content = COALESCE($2, content) "
+    "WHERE id = $3 RETURNING id, title, content;",
+
+    "PREPARE news_delete (integer) AS "
+    "DELETE FROM news WHERE id = $1 RETURNING id;",
+)
+
+if USE_PREPARED_STATEMENTS:
+    SQL_INSERT_NEWS = "EXECUTE news_insert (%s, %s);"
+    SQL_UPDATE_NEWS = "EXECUTE news_update (%s, %s, %s);"
+    SQL_DELETE_NEWS = "EXECUTE news_delete (%s);"
+else:
+    SQL_INSERT_NEWS = (
+        "INSERT INTO news (title, content) VALUES (%s, %s) RETURNING id;"
+    )
+    SQL_UPDATE_NEWS = (
+        "UPDATE news SET title = COALESCE(%s, title), "
+        "content = COALESCE(%s, content) "
+        "WHERE id = %s RETURNING id, title, content;"
+    )
+    SQL_DELETE_NEWS = "DELETE FROM news WHERE id = %s RETURNING id;"
+
+
+def _ensure_prepared(conn):
+    if not USE_PREPARED_STATEMENTS or conn.news_prepared:
+        return
+    with conn.cursor() as cur:
+        for stmt in PREPARED_STATEMENTS:
+            cur.execute(stmt)
+    conn.commit()
+    conn.news_prepared = True
+
+
+@contextmanager
+def db_conn():
+    if POOL is None:
+        raise psycopg2.OperationalError("connection pool unavailable")
+    deadline = time.monotonic() + POOL_TIMEOUT
+    while True:
+        try:
+            conn = POOL.getconn()
+            break
+        except psycopg2.pool.PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+    try:
+        _ensure_prepared(conn)
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        POOL.putconn(conn)
+
+
+@app.errorhandler(psycopg2.OperationalError)
+def handle_db_unavailable(e):
+    app.logger.error(f"Database unavailable: {e}")
+    return J({"error": "Database connection failed"}, 500)
+
+
+@app.errorhandler(psycopg2.pool.PoolError)
+def handle_pool_exhausted(e):
+    app.logger.error(f"Connection pool exhausted: {e}")
+    return J({"error": "Database pool exhausted, try again later"}, 503)
+
+
+# ==========================
+# 🔹 Redis Response Cache
+# ==========================
+R = redis.Redis(
+    host=os.environ.get('REDIS_HOST', 'localhost'),
+    port=int(os.environ.get('REDIS_PORT', '6379'))
+)
+
+# Expired entries are kept around this long past their TTL so they can be
+# served as a stale fallback while Postgres is down.
+CACHE_STALE_WINDOW = 300
+
+
+def _cached_response(entry):
+    return Response(
+        entry[b'body'],
+        status=int(entry[b'code']),
+        mimetype='application/json'
+    )
+
+
+def cached(ttl):
+    """Cache a GET view's JSON response in Redis, keyed by path + query."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = f"cache:{request.full_path}"
+            entry = None
+            try:
+                entry = R.hgetall(key)
+            except redis.RedisError as e:
+                app.logger.warning(f"Cache read failed: {e}")
+
+            if entry and time.time() < float(entry[b'stale_at']):
+                return _cached_response(entry)
+
+            try:
+                rv = view(*args, **kwargs)
+            except (psycopg2.OperationalError, psycopg2.pool.PoolError):
+                if entry:
+                    app.logger.warning(f"Serving stale cache for {key}")
+                    return _cached_response(entry)
+                raise
+
+            resp = app.make_response(rv)
+            if resp.status_code == 200:
+                now = time.time()
+                try:
+                    R.hset(key, mapping={
+                        'body': resp.get_data(),
+                        'code': resp.status_code,
+                        'generated_at': now,
+                        'stale_at': now + ttl
+                    })
+                    R.expire(key, ttl + CACHE_STALE_WINDOW)
+                except redis.RedisError as e:
+                    app.logger.warning(f"Cache write failed: {e}")
+            elif resp.status_code >= 500 and entry:
+                app.logger.warning(f"Serving stale cache for {key}")
+                return _cached_response(entry)
+            return resp
+        return wrapper
+    return decorator
+
+
+def invalidate_news_cache():
+    try:
+        for key in R.scan_iter(match="cache:/news*"):
+            R.delete(key)
+    except redis.RedisError as e:
+        app.logger.warning(f"Cache invalidation failed: {e}")
+
+
 # ==========================
 # 🔹 Health Check Endpoint
 # ==========================
 @app.route("/db-health", methods=["GET"])
+@cached(ttl=5)
 def db_health_check():
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({
+    try:
+        with db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+    except psycopg2.OperationalError:
+        return J({
             "status": "error",
             "message": "Database connection failed"
-        }), 500
+        }, 500)
 
-    conn.close()
-    return jsonify({
+    return J({
         "status": "ok",
         "message": "Database connection successful"
     })
@@ -58,7 +265,7 @@ def db_health_check():
 # ==========================
 @app.route("/", methods=["GET"])
 def index():
-    return jsonify({
+    return J({
         "message": "Welcome to the News API (with Postgres)!",
         "endpoints": {
             "list_all_news": "GET /news",
@@ -74,29 +281,31 @@ def index():
 # 🔹 CRUD: List News
 # ==========================
 @app.route("/news", methods=["GET"])
+@cached(ttl=30)
 def list_news():
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
+    # Keyset pagination: WHERE id > after walks the primary-key index, so a
+    # page costs the same whether the table holds a thousand rows or millions.
+    after = request.args.get('after', 0, type=int)
+    limit = max(1, min(request.args.get('limit', 100, type=int), 500))
 
     items = []
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT id, title, content FROM news ORDER BY id;")
-            rows = cur.fetchall()
-            for row in rows:
-                items.append({
-                    "id": row[0],
-                    "title": row[1],
-                    "content": row[2]
-                })
-    except Exception as e:
-        app.logger.error(f"Error listing news: {e}")
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
-
-    return jsonify({"count": len(items), "items": items})
+    with db_conn() as conn:
+        try:
+            # RealDictCursor builds the per-row dicts in C, and orjson
+            # serializes them as-is.
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(
+                    "SELECT id, title, content FROM news "
+                    "WHERE id > %s ORDER BY id LIMIT %s;",
+                    (after, limit)
+                )
+                items = cur.fetchall()
+        except Exception as e:
+            app.logger.error(f"Error listing news: {e}")
+            return J({"error": str(e)}, 500)
+
+    next_cursor = items[-1]["id"] if len(items) == limit else None
+    return J({"count": len(items), "items": items, "next_cursor": next_cursor})
 
 
 # ==========================
@@ -110,28 +319,113 @@ def create_news():
     title = request.json['title']
     content = request.json.get('content', "")
 
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
     new_item = {}
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                "INSERT INTO news (title, content) VALUES (%s, %s) RETURNING id;",
-                (title, content)
-            )
-            new_id = cur.fetchone()[0]
-            conn.commit()
-            new_item = {"id": new_id, "title": title, "content": content}
-    except Exception as e:
-        app.logger.error(f"Error creating news: {e}")
-        conn.rollback()
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
+    with db_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SQL_INSERT_NEWS, (title, content))
+                new_id = cur.fetchone()[0]
+                conn.commit()
+                new_item = {"id": new_id, "title": title, "content": content}
+                invalidate_news_cache()
+        except Exception as e:
+            app.logger.error(f"Error creating news: {e}")
+            conn.rollback()
+            return J({"error": str(e)}, 500)
+
+    return J(new_item, 201)
+
 
-    return jsonify(new_item), 201
+# ==========================
+# 🔹 CRUD: Bulk Create News
+# ==========================
+@app.route("/news/bulk", methods=["POST"])
+def create_news_bulk():
+    payload = request.json
+    if not isinstance(payload, list) or not payload:
+        abort(400)
+    if any(not isinstance(item, dict) or 'title' not in item for item in payload):
+        abort(400)
+
+    rows = [(item['title'], item.get('content', "")) for item in payload]
+
+    ids = []
+    with db_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                # Bulk path only: skip the WAL fsync for this transaction,
+                # same trade as /news/import. Single-item writes keep full
+                # durability.
+                cur.execute("SET LOCAL synchronous_commit = OFF;")
+                # One multi-row INSERT per 1000 rows: a single parse,
+                # round-trip and commit instead of one of each per row.
+                results = execute_values(
+                    cur,
+                    "INSERT INTO news (title, content) VALUES %s RETURNING id;",
+                    rows,
+                    page_size=1000,
+                    fetch=True
+                )
+                ids = [r[0] for r in results]
+                conn.commit()
+                invalidate_news_cache()
+        except Exception as e:
+            app.logger.error(f"Error bulk creating news: {e}")
+            conn.rollback()
+            return J({"error": str(e)}, 500)
+
+    return J({"count": len(ids), "ids": ids}, 201)
+
+
+# ==========================
+# 🔹 CRUD: Import News (COPY)
+# ==========================
+def _copy_escape(value):
+    """Escape a value for Postgres COPY text format."""
+    return (
+        value.replace('\\', '\\\\')
+             .replace('\t', '\\t')
+             .replace('\n', '\\n')
+             .replace('\r', '\\r')
+    )
+
+
+@app.route("/news/import", methods=["POST"])
+def import_news():
+    payload = request.json
+    if not isinstance(payload, list) or not payload:
+        abort(400)
+    if any(not isinstance(item, dict) or 'title' not in item for item in payload):
+        abort(400)
+
+    buf = io.StringIO()
+    for item in payload:
+        title = _copy_escape(str(item['title']))
+        content = _copy_escape(str(item.get('content', "")))
+        buf.write(f"{title}\t{content}\n")
+    buf.seek(0)
+
+    count = 0
+    with db_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                # Ingestion path: skip the WAL fsync for this transaction.
+                # A crash can lose the last moments of an import, which is
+                # an acceptable trade for an admin bulk load.
+                cur.execute("SET LOCAL synchronous_commit = OFF;")
+                cur.copy_expert(
+                    "COPY news (title, content) FROM STDIN WITH (FORMAT text)",
+                    buf
+                )
+                count = cur.rowcount
+                conn.commit()
+                invalidate_news_cache()
+        except Exception as e:
+            app.logger.error(f"Error importing news: {e}")
+            conn.rollback()
+            return J({"error": str(e)}, 500)
+
+    return J({"count": count}, 201)
 
 
 # ==========================
@@ -142,35 +436,30 @@ def update_news(item_id: int):
     if not request.json:
         abort(400)
 
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
     updated_item = {}
-    try:
-        with conn.cursor() as cur:
-            cur.execute("SELECT title, content FROM news WHERE id = %s;", (item_id,))
-            item = cur.fetchone()
-            if not item:
-                abort(404)
-
-            title = request.json.get('title', item[0])
-            content = request.json.get('content', item[1])
-
-            cur.execute(
-                "UPDATE news SET title = %s, content = %s WHERE id = %s;",
-                (title, content, item_id)
-            )
-            conn.commit()
-            updated_item = {"id": item_id, "title": title, "content": content}
-    except Exception as e:
-        app.logger.error(f"Error updating news: {e}")
-        conn.rollback()
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
-
-    return jsonify(updated_item)
+    with db_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                # Single round-trip: COALESCE keeps columns absent from the
+                # payload unchanged, RETURNING replaces the read-back SELECT.
+                cur.execute(
+                    SQL_UPDATE_NEWS,
+                    (request.json.get('title'), request.json.get('content'), item_id)
+                )
+                item = cur.fetchone()
+                if not item:
+                    abort(404)
+                conn.commit()
+                updated_item = {"id": item[0], "title": item[1], "content": item[2]}
+                invalidate_news_cache()
+        except HTTPException:
+            raise
+        except Exception as e:
+            app.logger.error(f"Error updating news: {e}")
+            conn.rollback()
+            return J({"error": str(e)}, 500)
+
+    return J(updated_item)
 
 
 # ==========================
@@ -178,30 +467,21 @@ def update_news(item_id: int):
 # ==========================
 @app.route("/news/<int:item_id>", methods=["DELETE"])
 def delete_news(item_id: int):
-    conn = get_db_connection()
-    if conn is None:
-        return jsonify({"error": "Database connection failed"}), 500
-
-    try:
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM news WHERE id = %s RETURNING id;", (item_id,))
-            deleted = cur.fetchone()
-            if not deleted:
-                abort(404)
-            conn.commit()
-    except Exception as e:
-        app.logger.error(f"Error deleting news: {e}")
-        conn.rollback()
-        return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
-
-    return jsonify({"status": "deleted", "id": item_id})
-
+    with db_conn() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(SQL_DELETE_NEWS, (item_id,))
+                deleted = cur.fetchone()
+                if not deleted:
+                    abort(404)
+                conn.commit()
+                invalidate_news_cache()
+        except HTTPException:
+            raise
+        except Exception as e:
+            app.logger.error(f"Error deleting news: {e}")
+            conn.rollback()
+            return J({"error": str(e)}, 500)
+
+    return J({"status": "deleted", "id": item_id})
 
-# ==========================
-# 🔹 Main Entry
-# ==========================
-if __name__ == "__main__":
-    print("🚀 Running News API with PostgreSQL backend...")
-    app.run(threaded=True, host='0.0.0.0', port=3000, debug=True)